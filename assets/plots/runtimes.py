@@ -12,82 +12,144 @@ Output: a single PDF with one subplot per (device, routine) combination,
 each showing speedup box plots of non-baseline competitors relative to baseline.
 """
 import argparse
+import io
+import os
 import re
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import matplotlib.pyplot as plt
 import numpy as np
 
+_DIGITS_RE = re.compile(r"(\d+)")
+_RUN_DIR_RE = re.compile(r"^(.+)-run(\d+)$")
+_SET2 = plt.get_cmap("Set2")
+
 
 def natural_sort_key(s: str):
-    return [int(c) if c.isdigit() else c.lower() for c in re.split(r"(\d+)", s)]
+    return [int(c) if c.isdigit() else c.lower() for c in _DIGITS_RE.split(s)]
+
+
+def read_runtimes(runtimes_file: Path) -> np.ndarray:
+    """
+    Parse a runtimes file (one value per line) into a float64 array.
+    Blank lines and lines that are not a number are skipped.
+    """
+    with open(runtimes_file) as f:
+        text = f.read()
+    # np.loadtxt warns on input without data; an empty file just has no runtimes.
+    if not text.strip():
+        return np.empty(0, dtype=np.float64)
+
+    # np.loadtxt splits on any whitespace; only take its result if every line
+    # held exactly one value, otherwise fall back to parsing line by line.
+    try:
+        arr = np.loadtxt(io.StringIO(text), dtype=np.float64, comments=None, ndmin=2)
+        if arr.shape[1] == 1:
+            return arr[:, 0]
+    except ValueError:
+        pass
+
+    values: list[float] = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            try:
+                values.append(float(line))
+            except ValueError:
+                pass
+    return np.asarray(values, dtype=np.float64)
+
+
+def _raise(err: OSError) -> None:
+    raise err
 
 
 def discover_data(
     experiment_dir: Path,
-) -> dict[tuple[str, str, str, str], list[float]]:
+) -> dict[tuple[str, str, str, str], np.ndarray]:
     """
     Walk experiment_dir/<routine>/<input_size>/<competitor>/<device>-run<N>/runtimes
-    and return {(routine, input_size, competitor, device): [runtimes]}.
+    and return {(routine, input_size, competitor, device): runtimes array}.
     """
-    data: dict[tuple[str, str, str, str], list[float]] = defaultdict(list)
-
-    for routine_dir in sorted(experiment_dir.iterdir()):
-        if not routine_dir.is_dir():
+    files: list[tuple[tuple[str, str, str, str], Path]] = []
+
+    # os.walk ignores unreadable directories by default; surface them instead.
+    for root, dirs, filenames in os.walk(
+        experiment_dir, onerror=_raise, followlinks=True
+    ):
+        parts = Path(root).relative_to(experiment_dir).parts
+        # Prune while descending: skip the "data" competitor, only enter
+        # <device>-run<N> directories and never go below them.
+        if len(parts) == 2:
+            dirs[:] = [d for d in dirs if d != "data"]
+        elif len(parts) == 3:
+            dirs[:] = [d for d in dirs if _RUN_DIR_RE.match(d)]
+        elif len(parts) == 4:
+            dirs.clear()
+        dirs.sort()
+
+        if len(parts) != 4 or "runtimes" not in filenames:
             continue
-        for is_dir in sorted(routine_dir.iterdir()):
-            if not is_dir.is_dir():
-                continue
-            for comp_dir in sorted(is_dir.iterdir()):
-                if not comp_dir.is_dir() or comp_dir.name == "data":
-                    continue
-                for run_dir in sorted(comp_dir.iterdir()):
-                    if not run_dir.is_dir():
-                        continue
-                    m = re.match(r"^(.+)-run(\d+)$", run_dir.name)
-                    if not m:
-                        continue
-                    device = m.group(1)
-                    runtimes_file = run_dir / "runtimes"
-                    if not runtimes_file.is_file():
-                        continue
-                    key = (routine_dir.name, is_dir.name, comp_dir.name, device)
-                    with open(runtimes_file) as f:
-                        for line in f:
-                            line = line.strip()
-                            if line:
-                                try:
-                                    data[key].append(float(line))
-                                except ValueError:
-                                    pass
-
-    return dict(data)
+        # filenames also lists broken symlinks and other non-regular entries.
+        runtimes_file = Path(root, "runtimes")
+        if not runtimes_file.is_file():
+            continue
+        routine, is_name, comp, run_dir_name = parts
+        device = _RUN_DIR_RE.match(run_dir_name).group(1)
+        files.append(((routine, is_name, comp, device), runtimes_file))
+
+    # Reading many small files is I/O bound and file reads release the GIL,
+    # so parse them concurrently. map() keeps results in discovery order.
+    chunks: dict[tuple[str, str, str, str], list[np.ndarray]] = defaultdict(list)
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        for (key, _), runtimes in zip(
+            files, ex.map(read_runtimes, [f for _, f in files])
+        ):
+            if runtimes.size:
+                chunks[key].append(runtimes)
+
+    return {key: np.concatenate(arrs) for key, arrs in chunks.items()}
+
+
+def compute_baseline_medians(
+    data: dict[tuple[str, str, str, str], np.ndarray],
+) -> dict[tuple[str, str, str], float]:
+    """
+    Return {(routine, input_size, device): median(baseline_runtimes)}.
+    """
+    return {
+        (routine, input_size, device): float(np.median(rts))
+        for (routine, input_size, comp, device), rts in data.items()
+        if comp == "baseline"
+    }
 
 
 def compute_speedups(
-    data: dict[tuple[str, str, str, str], list[float]],
+    data: dict[tuple[str, str, str, str], np.ndarray],
+    baseline_medians: dict[tuple[str, str, str], float],
     routine: str,
     input_size: str,
     device: str,
     competitors: list[str],
-) -> dict[str, list[float]]:
+) -> dict[str, np.ndarray]:
     """
     For each non-baseline competitor, compute speedup values as
     median(baseline_runtimes) / competitor_runtime.
     """
-    baseline_rts = data.get((routine, input_size, "baseline", device), [])
-    if not baseline_rts:
+    baseline_median = baseline_medians.get((routine, input_size, device))
+    if baseline_median is None:
         return {}
 
-    baseline_median = float(np.median(baseline_rts))
-    result: dict[str, list[float]] = {}
+    result: dict[str, np.ndarray] = {}
     for comp in competitors:
         if comp == "baseline":
             continue
-        rts = data.get((routine, input_size, comp, device), [])
-        if rts:
-            result[comp] = [baseline_median / rt for rt in rts]
+        rts = data.get((routine, input_size, comp, device))
+        if rts is not None:
+            result[comp] = baseline_median / rts
     return result
 
 
@@ -108,6 +170,7 @@ def main() -> None:
     data = discover_data(args.experiment_dir.resolve())
     if not data:
         raise SystemExit("No runtime data found.")
+    baseline_medians = compute_baseline_medians(data)
 
     routines = sorted({k[0] for k in data}, key=natural_sort_key)
     devices = sorted({k[3] for k in data}, key=natural_sort_key)
@@ -116,7 +179,11 @@ def main() -> None:
     if not nb_competitors:
         raise SystemExit("No non-baseline competitors found.")
 
-    panels = [(d, r) for d in devices for r in routines]
+    panel_input_sizes: dict[tuple[str, str], set[str]] = defaultdict(set)
+    for routine, is_name, _, device in data:
+        panel_input_sizes[(device, routine)].add(is_name)
+
+    panels = [(d, r) for d in devices for r in routines if (d, r) in panel_input_sizes]
     n = len(panels)
     ncols = min(n, 3)
     nrows = -(-n // ncols)
@@ -125,29 +192,27 @@ def main() -> None:
         nrows, ncols, figsize=(6 * ncols, 4 * nrows), squeeze=False
     )
 
-    cmap = plt.get_cmap("Set2")
     colors = {
-        comp: cmap(i / max(len(nb_competitors) - 1, 1))
+        comp: _SET2(i / max(len(nb_competitors) - 1, 1))
         for i, comp in enumerate(nb_competitors)
     }
 
     for idx, (device, routine) in enumerate(panels):
         ax = axes[idx // ncols][idx % ncols]
-        input_sizes = sorted(
-            {k[1] for k in data if k[0] == routine and k[3] == device},
-            key=natural_sort_key,
-        )
+        input_sizes = sorted(panel_input_sizes[(device, routine)], key=natural_sort_key)
 
         group_width = len(nb_competitors)
         box_width = 0.6
-        all_box_data: list[list[float]] = []
+        all_box_data: list[np.ndarray] = []
         all_positions: list[float] = []
         all_colors: list = []
         tick_positions: list[float] = []
         tick_labels: list[str] = []
 
         for g, is_name in enumerate(input_sizes):
-            speedups = compute_speedups(data, routine, is_name, device, competitors)
+            speedups = compute_speedups(
+                data, baseline_medians, routine, is_name, device, competitors
+            )
             group_start = g * (group_width + 1)
             for j, comp in enumerate(nb_competitors):
                 if comp in speedups: